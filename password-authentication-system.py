@@ -1,39 +1,325 @@
 # Import necessary libraries
+import atexit
 import getpass
+import hmac
 import json
 import re
 import os
 import bcrypt
-import random
+import secrets
 import time
 import smtplib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from email.message import EmailMessage
-from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv 
 
+# orjson is optional; falling back to the standard json module without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Loading environment variables from .env file
 load_dotenv()
 
+# Precompiled validation patterns
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9._]+$')
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+# Every password rule in one pattern, so a valid password takes a single match
+_PW_RE = re.compile(r'(?=.*[A-Z])(?=.*[a-z])(?=.*[0-9]).{8,}', re.DOTALL)
+
+# Deletion tables for bytes.translate: each one strips every byte outside
+# its character class, so a non-empty result means the class is present
+_NOT_UPPER = bytes(i for i in range(256) if not 65 <= i <= 90)
+_NOT_LOWER = bytes(i for i in range(256) if not 97 <= i <= 122)
+_NOT_DIGIT = bytes(i for i in range(256) if not 48 <= i <= 57)
+
+# Reserved snapshot key for database metadata; "$" can never appear in a username
+_META_KEY = "$meta"
+
+def _json_dumps(obj, pretty=False):
+    """Encoding an object as JSON bytes, using orjson when it's available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data):
+    """Decoding JSON bytes, using orjson when it's available."""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _parse_legacy_timestamp(value):
+    """Converting a "YYYY-MM-DD HH:MM:SS" local-time string to a Unix timestamp."""
+    # Slicing the fixed-width fields is much cheaper than datetime.strptime
+    return int(time.mktime((
+        int(value[0:4]), int(value[5:7]), int(value[8:10]),
+        int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        0, 0, -1
+    )))
+
+def _codes_match(entered_code, expected_code):
+    """Comparing verification codes in constant time."""
+    # Comparing bytes, since compare_digest rejects non-ASCII strings
+    return hmac.compare_digest(entered_code.encode('utf-8'), expected_code.encode('utf-8'))
+
+@dataclass(slots=True)
+class UserRecord:
+    """A user's stored credentials and lockout state."""
+    password_hash_bytes: bytes
+    email: str
+    failed_attempts: int
+    # Unix timestamp the lockout ends at, or 0 when the account isn't locked
+    locked_until: int
+    registered_on: int
+    
+    @classmethod
+    def from_json(cls, data):
+        """Building a record from its JSON form, migrating older field formats."""
+        # Migrating timestamps saved by older versions as local-time strings
+        for field in ("locked_until", "registered_on"):
+            if isinstance(data.get(field), str):
+                data[field] = _parse_legacy_timestamp(data[field])
+        return cls(
+            # Keeping the encoded hash in memory so logins don't re-encode it
+            password_hash_bytes=data["password_hash"].encode('utf-8'),
+            email=data["email"],
+            failed_attempts=data["failed_attempts"],
+            # Older versions stored None for accounts that weren't locked
+            locked_until=data["locked_until"] or 0,
+            registered_on=data["registered_on"]
+        )
+    
+    def to_json(self):
+        """Converting the record to its JSON form."""
+        return {
+            "password_hash": self.password_hash_bytes.decode('utf-8'),
+            "email": self.email,
+            "failed_attempts": self.failed_attempts,
+            "locked_until": self.locked_until,
+            "registered_on": self.registered_on
+        }
+
+@dataclass(frozen=True, slots=True)
+class EmailCfg:
+    """Email settings, read once from the environment."""
+    use_sim: bool
+    sender: str | None
+    password: str | None
+    smtp_server: str
+    # None in simulation mode or when SMTP_PORT isn't a valid number
+    smtp_port: int | None
+    subject: str
+    
+    @classmethod
+    def from_env(cls):
+        """Building the settings from environment variables."""
+        use_sim = os.environ.get('USE_EMAIL_SIMULATION', 'true').lower() == 'true'
+        
+        # The port only matters when sending real emails
+        smtp_port = None
+        if not use_sim:
+            raw_port = os.environ.get('SMTP_PORT', "587")
+            try:
+                smtp_port = int(raw_port)
+            except ValueError:
+                print(f"Invalid SMTP_PORT value {raw_port!r}; verification codes will be shown on screen instead.")
+        
+        return cls(
+            use_sim=use_sim,
+            sender=os.environ.get('EMAIL_SENDER'),
+            password=os.environ.get('EMAIL_PASSWORD'),
+            smtp_server=os.environ.get('SMTP_SERVER', "smtp.gmail.com"),
+            smtp_port=smtp_port,
+            subject=os.environ.get('EMAIL_SUBJECT', "Your Authentication Code")
+        )
+    
+    @property
+    def can_send(self):
+        """Whether there's enough configuration to send real emails."""
+        return bool(self.sender and self.password and self.smtp_port)
+
 class PasswordAuthenticator:
     def __init__(self, db_file="user_database.json"):
         self.db_file = db_file
+        self.log_file = db_file + ".log"
         self.max_failed_attempts = 5
         self.lockout_duration = 15 
+        # Largest bcrypt cost whose hash time stays under this target (seconds)
+        self.bcrypt_target_time = 0.3
+        self._cfg = EmailCfg.from_env()
+        # Serialised verification email, filled in per send by plain string replacement
+        self._email_template = None
+        if not self._cfg.use_sim and self._cfg.can_send:
+            self._email_template = self._build_email_template()
+        # SMTP connection reused across verification emails, which are sent
+        # in the background while the user is prompted for the code
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        self._mail_pool = ThreadPoolExecutor(max_workers=2)
         self.load_database()
+        atexit.register(self._log.close)
+        atexit.register(self._close_smtp)
+        atexit.register(self._mail_pool.shutdown)
+        self.bcrypt_cost = self._get_bcrypt_cost()
+        # Hash checked for unknown usernames so they take as long as real ones,
+        # at the highest cost stored hashes use (the "NN" in "$2b$NN$...")
+        dummy_cost = max(
+            (int(user_data.password_hash_bytes[4:6]) for user_data in self.database.values()),
+            default=self.bcrypt_cost
+        )
+        self._dummy_hash = bcrypt.hashpw(b"dummy", bcrypt.gensalt(rounds=dummy_cost))
     
     def load_database(self):
-        """Loading user database from JSON file or create if it doesn't exist."""
+        """Loading user database from JSON file and replaying the change log on top."""
+        # Users are keyed by their case-folded username, so raw records are
+        # grouped by it to catch names that differ only by case
+        self._log_size = 0
+        groups = {}
         if os.path.exists(self.db_file):
-            with open(self.db_file, 'r') as f:
-                self.database = json.load(f)
+            with open(self.db_file, 'rb') as f:
+                raw_database = _json_loads(f.read())
+            self.meta = raw_database.pop(_META_KEY, {})
+            for name, data in raw_database.items():
+                groups.setdefault(name.casefold(), {})[name] = data
+            self._snapshot_size = os.path.getsize(self.db_file)
         else:
-            self.database = {}
+            self.meta = {}
+            self._snapshot_size = 0
+        
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        event = _json_loads(line)
+                    except ValueError:
+                        # Skipping a partially written line left by a crash
+                        continue
+                    name, changes = event["u"], event["set"]
+                    group = groups.setdefault(name.casefold(), {})
+                    if name not in group and len(group) == 1 and "registered_on" not in changes:
+                        # Logs written before usernames were case-folded use the original spelling
+                        name = next(iter(group))
+                    group.setdefault(name, {}).update(changes)
+                    self._log_size += len(line)
+        
+        self.database = {}
+        self._case_collisions = set()
+        for folded, group in groups.items():
+            if len(group) == 1:
+                self.database[folded] = UserRecord.from_json(next(iter(group.values())))
+            else:
+                # Keeping accounts whose names differ only by case under their
+                # original spelling, rather than merging them into one
+                self._case_collisions.add(folded)
+                for name, data in group.items():
+                    self.database[name] = UserRecord.from_json(data)
+        if self._case_collisions:
+            names = ", ".join(sorted(k for k in self.database if k.casefold() in self._case_collisions))
+            print(f"Warning: usernames {names} differ only by case; they must be entered exactly.")
+        
+        self._log = open(self.log_file, 'ab', buffering=0)
+        if not os.path.exists(self.db_file):
             self.save_database()
     
     def save_database(self):
-        """Saving user database to JSON file."""
-        with open(self.db_file, 'w') as f:
-            json.dump(self.database, f, indent=4)
+        """Saving a full snapshot of the user database and clearing the change log."""
+        snapshot = {k: v.to_json() for k, v in self.database.items()}
+        snapshot[_META_KEY] = self.meta
+        # Writing to a temporary file and renaming it over the database, so a
+        # crash mid-write leaves the previous snapshot intact
+        tmp_file = self.db_file + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(_json_dumps(snapshot, pretty=True))
+            f.flush()
+            # The log is about to be truncated, so the snapshot must be on disk first
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.db_file)
+        self._log.truncate(0)
+        self._snapshot_size = os.path.getsize(self.db_file)
+        self._log_size = 0
+    
+    def _append_event(self, event):
+        """Appending a single change to the log, compacting it once it outgrows the snapshot."""
+        line = _json_dumps(event) + b'\n'
+        self._log.write(line)
+        self._log_size += len(line)
+        if self._log_size > 2 * self._snapshot_size:
+            self.save_database()
+    
+    def _user_key(self, username):
+        """Getting the database key for a username."""
+        folded = username.casefold()
+        # Names that differ only by case are stored under their exact spelling
+        return username if folded in self._case_collisions else folded
+    
+    def _add_user(self, username, user_data):
+        """Adding a new user record in memory and recording it in the log."""
+        key = self._user_key(username)
+        self.database[key] = user_data
+        self._append_event({"u": key, "set": user_data.to_json()})
+    
+    def _update_user(self, username, **changes):
+        """Applying field changes to a user in memory and recording them in the log."""
+        key = self._user_key(username)
+        user_data = self.database[key]
+        for field, value in changes.items():
+            setattr(user_data, field, value)
+        if "password_hash_bytes" in changes:
+            changes["password_hash"] = changes.pop("password_hash_bytes").decode('utf-8')
+        self._append_event({"u": key, "set": changes})
+    
+    def _get_bcrypt_cost(self):
+        """Getting the bcrypt cost from BCRYPT_COST, or from a cached one-time calibration."""
+        env_cost = os.environ.get('BCRYPT_COST')
+        if env_cost:
+            try:
+                cost = int(env_cost)
+            except ValueError:
+                cost = None
+            # bcrypt only accepts costs from 4 to 31
+            if cost is not None and 4 <= cost <= 31:
+                return cost
+            print(f"Invalid BCRYPT_COST value {env_cost!r}; using the calibrated cost instead.")
+        if "bcrypt_cost" not in self.meta:
+            self.meta["bcrypt_cost"] = self._calibrate_cost()
+            self.save_database()
+        return self.meta["bcrypt_cost"]
+    
+    def _calibrate_cost(self, min_cost=10, max_cost=16):
+        """Picking the largest bcrypt cost that hashes within bcrypt_target_time."""
+        # Each extra cost step doubles the work, so one timing at a cheap cost is enough
+        base_cost = 8
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=base_cost))
+        elapsed = time.perf_counter() - start
+        
+        cost = base_cost
+        while cost < max_cost and elapsed * 2 < self.bcrypt_target_time:
+            elapsed *= 2
+            cost += 1
+        return max(cost, min_cost)
+    
+    def _validate_password(self, password):
+        """Checking password complexity, returning an error message or None."""
+        if _PW_RE.fullmatch(password):
+            return None
+        
+        # Finding which rule failed, only needed for the error message
+        if len(password) < 8:
+            return "Password too short!"
+        password_bytes = password.encode('utf-8')
+        if not password_bytes.translate(None, _NOT_UPPER):
+            return "Password must contain at least one uppercase letter!"
+        if not password_bytes.translate(None, _NOT_LOWER):
+            return "Password must contain at least one lowercase letter!"
+        if not password_bytes.translate(None, _NOT_DIGIT):
+            return "Password must contain at least one number!"
+        return None
     
     def register_user(self):
         """Registering a new user with email verification."""
@@ -45,10 +331,10 @@ class PasswordAuthenticator:
             if len(username) < 4:
                 print("Username too short!")
                 continue
-            if not re.match(r'^[a-zA-Z0-9._]+$', username):
+            if not _USERNAME_RE.match(username):
                 print("Username contains invalid characters!")
                 continue
-            if username in self.database:
+            if username.casefold() in self.database or username.casefold() in self._case_collisions:
                 print("Username already exists!")
                 continue
             break
@@ -57,7 +343,7 @@ class PasswordAuthenticator:
         while True:
             email = input("Enter email address: ")
             # A basic email validation - in a production app, you'd want to verify this email
-            if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', email):
+            if not _EMAIL_RE.match(email):
                 print("Invalid email format!")
                 continue
             
@@ -68,7 +354,7 @@ class PasswordAuthenticator:
             # Give the user 3 attempts to enter the correct verification code
             for attempt in range(3):
                 user_code = input("Enter the verification code sent to your email: ")
-                if user_code == verification_code:
+                if _codes_match(user_code, verification_code):
                     print("Email verified successfully!")
                     break
                 else:
@@ -88,17 +374,9 @@ class PasswordAuthenticator:
         # Getting and validating password
         while True:
             password = getpass.getpass("Create password (min 8 chars, must include uppercase, lowercase, number): ")
-            if len(password) < 8:
-                print("Password too short!")
-                continue
-            if not re.search(r'[A-Z]', password):
-                print("Password must contain at least one uppercase letter!")
-                continue
-            if not re.search(r'[a-z]', password):
-                print("Password must contain at least one lowercase letter!")
-                continue
-            if not re.search(r'[0-9]', password):
-                print("Password must contain at least one number!")
+            error = self._validate_password(password)
+            if error:
+                print(error)
                 continue
             
             confirm_password = getpass.getpass("Confirm password: ")
@@ -108,53 +386,62 @@ class PasswordAuthenticator:
             break
         
         # Hashing the password with bcrypt
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_cost)
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
         
         # Creating user entry
-        self.database[username] = {
-            "password_hash": hashed_password.decode('utf-8'),
-            "email": email,
-            "failed_attempts": 0,
-            "locked_until": None,
-            "registered_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        self.save_database()
+        self._add_user(username, UserRecord(
+            password_hash_bytes=hashed_password,
+            email=email,
+            failed_attempts=0,
+            locked_until=0,
+            registered_on=int(time.time())
+        ))
         print(f"\nUser {username} registered successfully!")
         return True
     
     def check_account_lockout(self, username):
         """Checking if an account is locked due to too many failed attempts."""
-        user_data = self.database.get(username)
+        user_data = self.database.get(self._user_key(username))
         if not user_data:
             return False
         
-        if user_data.get("locked_until"):
-            lock_time = datetime.strptime(user_data["locked_until"], "%Y-%m-%d %H:%M:%S")
-            if datetime.now() < lock_time:
-                remaining = (lock_time - datetime.now()).total_seconds() / 60
+        lock_time = user_data.locked_until
+        if lock_time:
+            now = time.time()
+            if now < lock_time:
+                remaining = (lock_time - now) / 60
                 print(f"Account is locked! Try again in {remaining:.1f} minutes.")
                 return True
             else:
                 # Resetting failed attempts after lockout period
-                user_data["failed_attempts"] = 0
-                user_data["locked_until"] = None
-                self.save_database()
+                self._update_user(username, failed_attempts=0, locked_until=0)
         return False
     
+    def _record_failed_attempt(self, username, user_data):
+        """Counting a wrong password on an unlocked account, locking it after too many."""
+        now = time.time()
+        if user_data.locked_until:
+            # Starting a fresh count once the lockout period has passed
+            failed_attempts = 1
+        else:
+            failed_attempts = user_data.failed_attempts + 1
+        
+        if failed_attempts >= self.max_failed_attempts:
+            locked_until = int(now) + self.lockout_duration * 60
+        else:
+            locked_until = 0
+        self._update_user(username, failed_attempts=failed_attempts, locked_until=locked_until)
+    
     def send_verification_code(self, email, username=None):
         """Sending a verification code to the user's email."""
         # Generating a 6-digit code
-        code = ''.join([str(random.randint(0, 9)) for _ in range(6)])
-        
-        # Email configuration
-        use_simulation = os.environ.get('USE_EMAIL_SIMULATION', 'true').lower() == 'true'
+        code = f"{secrets.randbelow(1_000_000):06d}"
         
         # Always send to the actual user email now (removing test recipient override)
         recipient_email = email
         
-        if use_simulation:
+        if self._cfg.use_sim:
             # Simulation mode output
             print("\n" + "="*40)
             print("EMAIL SIMULATION MODE")
@@ -170,30 +457,48 @@ class PasswordAuthenticator:
             return code
         
         # Real email mode
-        sender_email = os.environ.get('EMAIL_SENDER')
-        sender_password = os.environ.get('EMAIL_PASSWORD')
-        
-        if not sender_email or not sender_password:
-            print("Email configuration not found in environment variables.")
+        if not self._cfg.can_send:
+            print("Email configuration missing or invalid in environment variables.")
             return self._fallback_verification(code, recipient_email)
         
+        print(f"\nSending email to {recipient_email}...")
+        self._mail_pool.submit(self._send_smtp, code, recipient_email, username)
+        return code
+    
+    def _send_smtp(self, code, recipient_email, username):
+        """Sending the verification email, run on the mail thread pool."""
         try:
-            # Importing necessary libraries
-            import smtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            print(f"\nSending email to {recipient_email}...")
-            
-            message = MIMEMultipart()
-            message["From"] = sender_email
-            message["To"] = recipient_email
-            message["Subject"] = os.environ.get('EMAIL_SUBJECT', "Your Authentication Code")
+            message = (self._email_template
+                       .replace("{{CODE}}", code)
+                       .replace("{{USER}}", username or "there")
+                       .replace("{{TO}}", recipient_email))
             
-            body = f"""
-    Hello {username},
+            # Both mail threads share one connection, so only one may use it at a time
+            with self._smtp_lock:
+                try:
+                    server = self._get_smtp()
+                    server.sendmail(self._cfg.sender, recipient_email, message)
+                except smtplib.SMTPServerDisconnected:
+                    # The server dropped the cached connection between the NOOP and the send
+                    self._smtp = None
+                    server = self._get_smtp()
+                    server.sendmail(self._cfg.sender, recipient_email, message)
+        
+        except Exception as e:
+            print(f"\nFailed to send email: {str(e)}")
+            self._fallback_verification(code, recipient_email)
+    
+    def _build_email_template(self):
+        """Building the verification email once, with placeholders for the per-send values."""
+        message = MIMEMultipart()
+        message["From"] = self._cfg.sender
+        message["To"] = "{{TO}}"
+        message["Subject"] = self._cfg.subject
+        
+        body = """
+    Hello {{USER}},
 
-    Your verification code is: {code}
+    Your verification code is: {{CODE}}
 
     This code will expire in 10 minutes.
 
@@ -202,29 +507,36 @@ class PasswordAuthenticator:
     Best regards,
     Password Authentication System
     """
-            
-            message.attach(MIMEText(body, "plain"))
-            
-            # Connecting using port 587 (TLS) which is more reliable than 465 (SSL)
-            server = smtplib.SMTP(os.environ.get('SMTP_SERVER', "smtp.gmail.com"), 
-                                int(os.environ.get('SMTP_PORT', 587)))
-            server.starttls()  
-            
-            print("Attempting to log in to email server...")
-            server.login(sender_email, sender_password)
-            
-            print("Sending message...")
-            server.sendmail(sender_email, recipient_email, message.as_string())
-            
-            print("Closing connection...")
-            server.quit()
-            
-            print(f"Verification code sent successfully to {recipient_email}")
-            return code
         
-        except Exception as e:
-            print(f"Failed to send email: {str(e)}")
-            return self._fallback_verification(code, recipient_email)
+        message.attach(MIMEText(body, "plain"))
+        return message.as_string()
+    
+    def _get_smtp(self):
+        """Getting the cached SMTP connection, connecting again if it has gone stale."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        
+        # Connecting using port 587 (TLS) which is more reliable than 465 (SSL)
+        server = smtplib.SMTP(self._cfg.smtp_server, self._cfg.smtp_port)
+        server.starttls()  
+        server.login(self._cfg.sender, self._cfg.password)
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Closing the cached SMTP connection, if there is one."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
     
     def _fallback_verification(self, code, recipient_email):
         """Fallback method when email sending fails."""
@@ -241,53 +553,42 @@ class PasswordAuthenticator:
         print("\n=== User Login ===")
         
         username = input("Enter username: ")
-        
-        # Checking if username exists
-        if username not in self.database:
-            print("Username doesn't exist!")
-            return False
-        
-        # Checking if account is locked
-        if self.check_account_lockout(username):
-            return False
-        
         password = getpass.getpass("Enter your password: ")
-        user_data = self.database[username]
+        user_data = self.database.get(self._user_key(username))
         
-        # Checking password using bcrypt
+        # Checking password using bcrypt, against the dummy hash for unknown
+        # usernames so that they can't be told apart by response time
         password_match = bcrypt.checkpw(
             password.encode('utf-8'), 
-            user_data["password_hash"].encode('utf-8')
+            user_data.password_hash_bytes if user_data else self._dummy_hash
         )
         
-        if not password_match:
-            # Increment failed attempts
-            user_data["failed_attempts"] += 1
-            
-            # Checking if we need to lock the account
-            if user_data["failed_attempts"] >= self.max_failed_attempts:
-                lock_time = datetime.now() + timedelta(minutes=self.lockout_duration)
-                user_data["locked_until"] = lock_time.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"Too many failed attempts! Account locked for {self.lockout_duration} minutes.")
-            else:
-                attempts_left = self.max_failed_attempts - user_data["failed_attempts"]
-                print(f"Incorrect password! {attempts_left} attempts remaining.")
-            
-            self.save_database()
+        # Refusing a locked account whether or not the password matched, so
+        # guesses made during the lockout learn nothing
+        if user_data and time.time() < user_data.locked_until:
+            print("Invalid username or password!")
             return False
         
-        # Resetting failed attempts on successful password entry
-        user_data["failed_attempts"] = 0
-        self.save_database()
+        # Giving the same answer for unknown usernames and wrong passwords, so
+        # the response doesn't reveal which usernames exist
+        if not user_data or not password_match:
+            if user_data:
+                self._record_failed_attempt(username, user_data)
+            print("Invalid username or password!")
+            return False
+        
+        # Resetting failed attempts and any expired lockout on successful password entry
+        if user_data.failed_attempts or user_data.locked_until:
+            self._update_user(username, failed_attempts=0, locked_until=0)
         
         # Two-factor authentication
         print("\nTwo-factor authentication required!")
-        verification_code = self.send_verification_code(user_data["email"], username)
+        verification_code = self.send_verification_code(user_data.email, username)
         
         # In a real application, give the user a few attempts to enter the correct code
         for attempt in range(3):
             user_code = input("Enter the verification code sent to your email: ")
-            if user_code == verification_code:
+            if _codes_match(user_code, verification_code):
                 print(f"\nWelcome to the system, {username}!")
                 return True
             else:
@@ -301,7 +602,7 @@ class PasswordAuthenticator:
         print("\n=== Password Reset ===")
         
         username = input("Enter your username: ")
-        if username not in self.database:
+        if self._user_key(username) not in self.database:
             print("Username doesn't exist!")
             return False
         
@@ -309,31 +610,22 @@ class PasswordAuthenticator:
         if self.check_account_lockout(username):
             return False
         
-        user_data = self.database[username]
-        email = user_data["email"]
+        email = self.database[self._user_key(username)].email
         
         # Send verification code to user's email
         verification_code = self.send_verification_code(email)
         
         user_code = input("Enter the verification code sent to your email: ")
-        if user_code != verification_code:
+        if not _codes_match(user_code, verification_code):
             print("Invalid verification code!")
             return False
         
         # Setting new password
         while True:
             new_password = getpass.getpass("Enter new password (min 8 chars, must include uppercase, lowercase, number): ")
-            if len(new_password) < 8:
-                print("Password too short!")
-                continue
-            if not re.search(r'[A-Z]', new_password):
-                print("Password must contain at least one uppercase letter!")
-                continue
-            if not re.search(r'[a-z]', new_password):
-                print("Password must contain at least one lowercase letter!")
-                continue
-            if not re.search(r'[0-9]', new_password):
-                print("Password must contain at least one number!")
+            error = self._validate_password(new_password)
+            if error:
+                print(error)
                 continue
             
             confirm_password = getpass.getpass("Confirm new password: ")
@@ -343,12 +635,14 @@ class PasswordAuthenticator:
             break
         
         # Updating password
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_cost)
         hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), salt)
-        user_data["password_hash"] = hashed_password.decode('utf-8')
-        user_data["failed_attempts"] = 0
-        user_data["locked_until"] = None
-        self.save_database()
+        self._update_user(
+            username,
+            password_hash_bytes=hashed_password,
+            failed_attempts=0,
+            locked_until=0
+        )
         
         print("\nPassword reset successful!")
         return True
@@ -370,17 +664,21 @@ class PasswordAuthenticator:
             }
         }
         
-        for username, data in demo_users.items():
-            salt = bcrypt.gensalt()
-            hashed_password = bcrypt.hashpw(data["password"].encode('utf-8'), salt)
-            
-            self.database[username] = {
-                "password_hash": hashed_password.decode('utf-8'),
-                "email": data["email"],
-                "failed_attempts": 0,
-                "locked_until": None,
-                "registered_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
+        # Hashing in parallel, since bcrypt releases the GIL while it works
+        with ThreadPoolExecutor(max_workers=min(len(demo_users), os.cpu_count() or 1)) as executor:
+            hashes = list(executor.map(
+                lambda data: bcrypt.hashpw(data["password"].encode('utf-8'), bcrypt.gensalt(rounds=self.bcrypt_cost)),
+                demo_users.values()
+            ))
+        
+        for (username, data), hashed_password in zip(demo_users.items(), hashes):
+            self.database[username] = UserRecord(
+                password_hash_bytes=hashed_password,
+                email=data["email"],
+                failed_attempts=0,
+                locked_until=0,
+                registered_on=int(time.time())
+            )
         
         self.save_database()
         print("Demo users created successfully!")